@@ -1,15 +1,17 @@
 import os from 'os';
-import path from 'path';
 
 export const CONFIG = {
   PORT: process.env.PORT || 4000,
+  // Optional UNIX domain socket path; when set the server listens here
+  // instead of PORT (for use behind a TLS-terminating reverse proxy)
+  SOCKET_PATH: process.env.SOCKET_PATH || null,
   FUNCTION_INTERVAL: process.env.FUNCTION_INTERVAL || 5000,
   SCREENSHOTS_PATH:
     process.env.SCREENSHOTS_PATH || '/Users/parmeet1.0/Documents/screenshots',
-  UPLOAD_DIR: path.join(process.cwd(), 'uploads'),
   MAX_FILE_SIZE: 10 * 1024 * 1024, // 10MB
   ALLOWED_IMAGE_TYPES: /jpeg|jpg|png|gif|bmp|webp/,
   BLACKLISTED_FILES: ['.DS_Store'],
+  MAX_PROCESSED_ITEMS: 500, // History kept in memory for GET /api/data
   REFRESH_INTERVAL: 2000, // COMMENTED OUT: Frontend removed - 2 seconds for frontend refresh (no longer used)
 };
 
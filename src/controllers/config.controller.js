@@ -11,27 +11,36 @@ const CONFIG_FILE_PATH = path.join(
 );
 
 class ConfigController {
-  getConfigFilePath() {
+  async getConfigFilePath() {
     // Ensure config directory exists
     const configDir = path.dirname(CONFIG_FILE_PATH);
-    if (!fs.existsSync(configDir)) {
-      fs.mkdirSync(configDir, { recursive: true });
-    }
+    await fs.promises.mkdir(configDir, { recursive: true });
     return CONFIG_FILE_PATH;
   }
 
-  getApiKeys(req, res) {
+  async readConfigFile(configPath) {
+    try {
+      return await fs.promises.readFile(configPath, 'utf8');
+    } catch (err) {
+      if (err.code === 'ENOENT') {
+        return null;
+      }
+      throw err;
+    }
+  }
+
+  async getApiKeys(req, res) {
     try {
-      const configPath = this.getConfigFilePath();
+      const configPath = await this.getConfigFilePath();
+      const configData = await this.readConfigFile(configPath);
 
-      if (!fs.existsSync(configPath)) {
+      if (configData === null) {
         return res.json({
           success: true,
           config: null,
         });
       }
 
-      const configData = fs.readFileSync(configPath, 'utf8');
       const config = JSON.parse(configData);
 
       // Return keys as masked (only show if they exist, not the actual values)
@@ -59,7 +68,7 @@ class ConfigController {
     }
   }
 
-  saveApiKeys(req, res) {
+  async saveApiKeys(req, res) {
     try {
       const { keys, order, enabled } = req.body;
 
@@ -70,17 +79,17 @@ class ConfigController {
         });
       }
 
-      const configPath = this.getConfigFilePath();
+      const configPath = await this.getConfigFilePath();
       let existingConfig = { keys: {}, order: [], enabled: [] };
 
       // Load existing config to preserve keys that aren't being updated
-      if (fs.existsSync(configPath)) {
-        try {
-          const existingData = fs.readFileSync(configPath, 'utf8');
+      try {
+        const existingData = await this.readConfigFile(configPath);
+        if (existingData !== null) {
           existingConfig = JSON.parse(existingData);
-        } catch (err) {
-          log.warn('Could not read existing config, starting fresh');
         }
+      } catch (err) {
+        log.warn('Could not read existing config, starting fresh');
       }
 
       // Merge new keys with existing keys (only update keys that are provided)
@@ -120,7 +129,7 @@ class ConfigController {
         enabled: enabledProviders,
       };
 
-      fs.writeFileSync(
+      await fs.promises.writeFile(
         configPath,
         JSON.stringify(configToSave, null, 2),
         'utf8',
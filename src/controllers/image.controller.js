@@ -1,4 +1,3 @@
-import fs from 'fs';
 import imageProcessingService from '../services/image-processing.service.js';
 import { upload } from '../middleware/upload.middleware.js';
 import logger from '../utils/logger.js';
@@ -13,36 +12,27 @@ class ImageController {
         .json({ success: false, error: 'No file uploaded' });
     }
 
-    const filePath = req.file.path;
     const fileName = req.file.originalname;
     const useContextEnabled = imageProcessingService.getUseContextEnabled();
 
     try {
       const result = await imageProcessingService.processImage(
-        filePath,
+        req.file.buffer,
         fileName,
         useContextEnabled,
       );
 
-      // Clean up uploaded file after processing
-      fs.unlink(filePath, (err) => {
-        if (err) log.error('Error deleting uploaded file', err);
-      });
-
       res.json({
         success: true,
         message: 'Image processed successfully',
         filename: fileName,
         extractedText: result.extractedText.substring(0, 200) + '...',
-        gptResponse: result.gptResponse.substring(0, 200) + '...',
+        gptResponse: result.gptResponse
+          ? result.gptResponse.substring(0, 200) + '...'
+          : null,
         usedContext: result.usedContext,
       });
     } catch (err) {
-      // Clean up uploaded file on error
-      fs.unlink(filePath, (err) => {
-        if (err) log.error('Error deleting uploaded file', err);
-      });
-
       log.error('Error processing image', err);
       res.status(500).json({
         success: false,
@@ -1,22 +1,10 @@
 import multer from 'multer';
 import path from 'path';
-import fs from 'fs';
 import { CONFIG } from '../config/constants.js';
 
-// Ensure upload directory exists
-if (!fs.existsSync(CONFIG.UPLOAD_DIR)) {
-  fs.mkdirSync(CONFIG.UPLOAD_DIR, { recursive: true });
-}
-
-const storage = multer.diskStorage({
-  destination: (req, file, cb) => {
-    cb(null, CONFIG.UPLOAD_DIR);
-  },
-  filename: (req, file, cb) => {
-    const uniqueSuffix = Date.now() + '-' + Math.round(Math.random() * 1e9);
-    cb(null, 'upload-' + uniqueSuffix + path.extname(file.originalname));
-  },
-});
+// Keep uploads in memory: the image is only needed for OCR, so writing it to
+// disk and reading it back would be wasted I/O (size is capped by limits)
+const storage = multer.memoryStorage();
 
 const fileFilter = (req, file, cb) => {
   const extname = CONFIG.ALLOWED_IMAGE_TYPES.test(
@@ -1,9 +1,12 @@
+import fs from 'fs';
 import http from 'http';
+import net from 'net';
 import { Server } from 'socket.io';
 import app from './app.js';
 import screenshotMonitorService from './services/screenshot-monitor.service.js';
 import DataHandler from './sockets/dataHandler.js';
 import imageProcessingService from './services/image-processing.service.js';
+import ocrService from './services/ocr.service.js';
 import { CONFIG, getLocalIP } from './config/constants.js';
 import logger from './utils/logger.js';
 
@@ -17,6 +20,12 @@ try {
   log.error('Failed to start screenshot monitoring service', error);
 }
 
+// Warm up the OCR workers now so the first screenshot does not wait on
+// Tesseract loading its language data
+ocrService.getScheduler().catch((error) => {
+  log.error('Failed to preload OCR workers', error);
+});
+
 // HTTP server
 const httpServer = http.createServer(app);
 
@@ -35,33 +44,91 @@ const io = new Server(httpServer, {
 const dataHandler = new DataHandler(io);
 imageProcessingService.setDataHandlers([dataHandler]);
 
-httpServer.listen(CONFIG.PORT, '0.0.0.0', () => {
-  const localIP = getLocalIP();
-  log.info('Server started');
-  log.info(
-    `API: http://localhost:${CONFIG.PORT} | http://${localIP}:${CONFIG.PORT}`,
-  );
-  log.info(
-    `Data Updates: ws://localhost:${CONFIG.PORT}/data-updates | ws://${localIP}:${CONFIG.PORT}/data-updates`,
-  );
-});
+/**
+ * Remove a stale UNIX socket left behind by a previous run
+ * Refuses to touch anything that is not a socket, and fails if another
+ * process is still accepting connections on it
+ */
+const removeStaleSocket = async (socketPath) => {
+  let stats;
+  try {
+    stats = fs.lstatSync(socketPath);
+  } catch (err) {
+    if (err.code === 'ENOENT') {
+      return;
+    }
+    throw err;
+  }
+
+  if (!stats.isSocket()) {
+    throw new Error(
+      `${socketPath} exists and is not a socket, not removing it`,
+    );
+  }
+
+  const inUse = await new Promise((resolve) => {
+    const probe = net.connect(socketPath);
+    probe.once('connect', () => {
+      probe.destroy();
+      resolve(true);
+    });
+    probe.once('error', () => resolve(false));
+  });
+
+  if (inUse) {
+    throw new Error(`Another process is already listening on ${socketPath}`);
+  }
+
+  fs.unlinkSync(socketPath);
+};
+
+if (CONFIG.SOCKET_PATH) {
+  try {
+    await removeStaleSocket(CONFIG.SOCKET_PATH);
+  } catch (error) {
+    log.error('Cannot listen on UNIX socket', error);
+    process.exit(1);
+  }
+
+  httpServer.listen(CONFIG.SOCKET_PATH, () => {
+    log.info('Server started');
+    log.info(`Listening on UNIX socket: ${CONFIG.SOCKET_PATH}`);
+  });
+} else {
+  httpServer.listen(CONFIG.PORT, '0.0.0.0', () => {
+    const localIP = getLocalIP();
+    log.info('Server started');
+    log.info(
+      `API: http://localhost:${CONFIG.PORT} | http://${localIP}:${CONFIG.PORT}`,
+    );
+    log.info(
+      `Data Updates: ws://localhost:${CONFIG.PORT}/data-updates | ws://${localIP}:${CONFIG.PORT}/data-updates`,
+    );
+  });
+}
 
 // Graceful shutdown handlers
 const gracefulShutdown = () => {
   log.info('Shutting down...');
   screenshotMonitorService.stop && screenshotMonitorService.stop();
 
-  if (httpServer) {
-    httpServer.close(() => {
-      log.info('Server closed');
-      process.exit(0);
-    });
-  }
+  // Wait for the OCR workers and the server before exiting. io.close()
+  // disconnects open sockets before closing the HTTP server;
+  // httpServer.close() alone waits on them and never completes
+  Promise.allSettled([
+    ocrService.terminate().catch((error) => {
+      log.error('Failed to terminate OCR workers', error);
+    }),
+    new Promise((resolve) => io.close(resolve)),
+  ]).then(() => {
+    log.info('Server closed');
+    process.exit(0);
+  });
 
   setTimeout(() => {
     log.warn('Force exit');
     process.exit(1);
-  }, 5000);
+  }, 5000).unref();
 };
 
 process.on('SIGINT', gracefulShutdown);
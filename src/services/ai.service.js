@@ -1,8 +1,6 @@
-import OpenAI from 'openai';
-import Groq from 'groq-sdk';
-import { GoogleGenerativeAI } from '@google/generative-ai';
 import dotenv from 'dotenv';
 import fs from 'fs';
+import crypto from 'crypto';
 import path from 'path';
 import logger from '../utils/logger.js';
 
@@ -17,21 +15,144 @@ const CONFIG_FILE_PATH = path.join(
   'api-keys.json',
 );
 
+// Map prompt types to filenames (in the prompts/ directory)
+const PROMPT_FILES = Object.freeze({
+  system: 'system-prompt.txt',
+  context: 'context-prompt.txt',
+  transcription: 'transcription-prompt.txt',
+  debug: 'debug-prompt.txt',
+  coding: 'coding-prompt.txt',
+  theory: 'theory-prompt.txt',
+});
+
+// Completion options shared by every ask* request
+const DEFAULT_COMPLETION_OPTIONS = Object.freeze({
+  temperature: 0.7,
+  max_tokens: 2048,
+});
+
+// Deadline for a single provider call. Calls share a few request slots, so
+// a stalled call must fail (and fall back) rather than hold its slot for the
+// SDK's own multi-minute default. Retries are left to the provider fallback
+const AI_REQUEST_TIMEOUT = parseInt(process.env.AI_TIMEOUT_MS, 10) || 60 * 1000;
+
+// Identical requests share one provider call while it is in flight and
+// reuse its answer for this long after it settles
+const RESPONSE_CACHE_TTL = 10 * 1000;
+const RESPONSE_CACHE_MAX_ENTRIES = 32;
+
 class AIService {
   constructor() {
+    // Loaded asynchronously before each request (see reloadConfig)
     this.config = null;
-    this.loadConfig();
     // Track failed providers with timestamps
     // Format: { providerId: timestamp }
     this.failedProviders = new Map();
     // Retry failed providers after 5 minutes (300000 ms)
     this.FAILURE_TIMEOUT = 5 * 60 * 1000;
+    // Cap concurrent provider requests so bursts queue instead of
+    // tripping provider rate limits
+    this.MAX_CONCURRENT_REQUESTS =
+      parseInt(process.env.AI_CONCURRENCY, 10) || 2;
+    this.activeRequests = 0;
+    this.requestQueue = [];
+    // Pending and recent AI responses keyed by a hash of the request, so a
+    // screenshot or prompt sent twice in quick succession makes one call
+    // Format: { cacheKey: { response: Promise, expiresAt } }
+    this.responseCache = new Map();
+    // Prompt file contents keyed by filename, with the mtime they were read at
+    this.promptCache = new Map();
+    // SDK clients per provider, reused while the API key is unchanged
+    this.clients = new Map();
   }
 
-  loadConfig() {
+  /**
+   * Get the SDK client for a provider, creating it on first use or when the
+   * configured key changes; reusing it keeps HTTP connections alive across
+   * requests instead of paying a new TLS handshake each time
+   * The SDK module itself is imported inside createClient, so providers
+   * that are never configured never load their SDK
+   */
+  async getClient(providerId, apiKey, createClient) {
+    const cached = this.clients.get(providerId);
+    if (cached && cached.apiKey === apiKey) {
+      return cached.client;
+    }
+
+    // Cache the promise so concurrent first calls share one client
+    const client = createClient(apiKey);
+    this.clients.set(providerId, { apiKey, client });
     try {
-      if (fs.existsSync(CONFIG_FILE_PATH)) {
-        const configData = fs.readFileSync(CONFIG_FILE_PATH, 'utf8');
+      return await client;
+    } catch (err) {
+      // Allow the next call to retry (e.g. a failed SDK import)
+      if (this.clients.get(providerId)?.client === client) {
+        this.clients.delete(providerId);
+      }
+      throw err;
+    }
+  }
+
+  /**
+   * Build the response cache key from the request and the providers that
+   * would serve it, so a changed provider list never reuses an old answer
+   */
+  getResponseCacheKey(messages, options, providers) {
+    return crypto
+      .createHash('sha256')
+      .update(JSON.stringify([messages, options, providers]))
+      .digest('hex');
+  }
+
+  getCachedResponse(cacheKey) {
+    const entry = this.responseCache.get(cacheKey);
+    if (!entry) {
+      return undefined;
+    }
+    if (performance.now() > entry.expiresAt) {
+      this.responseCache.delete(cacheKey);
+      return undefined;
+    }
+    return entry.response;
+  }
+
+  /**
+   * Share a pending provider call; the entry expires RESPONSE_CACHE_TTL after
+   * it resolves and is dropped straight away if it fails
+   */
+  setCachedResponse(cacheKey, response) {
+    const entry = { response, expiresAt: Infinity };
+    this.responseCache.set(cacheKey, entry);
+    if (this.responseCache.size > RESPONSE_CACHE_MAX_ENTRIES) {
+      // Evict the oldest entry
+      const oldestKey = this.responseCache.keys().next().value;
+      this.responseCache.delete(oldestKey);
+    }
+
+    response.then(
+      () => {
+        entry.expiresAt = performance.now() + RESPONSE_CACHE_TTL;
+      },
+      () => {
+        if (this.responseCache.get(cacheKey) === entry) {
+          this.responseCache.delete(cacheKey);
+        }
+      },
+    );
+  }
+
+  async loadConfig() {
+    try {
+      const configData = await fs.promises
+        .readFile(CONFIG_FILE_PATH, 'utf8')
+        .catch((err) => {
+          if (err.code === 'ENOENT') {
+            return null;
+          }
+          throw err;
+        });
+
+      if (configData !== null) {
         this.config = JSON.parse(configData);
       } else {
         // Fallback to environment variables for backward compatibility
@@ -60,12 +181,12 @@ class AIService {
     }
   }
 
-  reloadConfig() {
-    this.loadConfig();
+  async reloadConfig() {
+    await this.loadConfig();
   }
 
-  getAvailableProviders() {
-    this.reloadConfig();
+  async getAvailableProviders() {
+    await this.reloadConfig();
     if (!this.config) {
       return [];
     }
@@ -87,7 +208,7 @@ class AIService {
     });
 
     // Filter out recently failed providers (unless timeout has passed)
-    const now = Date.now();
+    const now = performance.now();
     return availableProviders.filter((providerId) => {
       const failedAt = this.failedProviders.get(providerId);
       if (!failedAt) {
@@ -111,7 +232,7 @@ class AIService {
   }
 
   markProviderAsFailed(providerId) {
-    this.failedProviders.set(providerId, Date.now());
+    this.failedProviders.set(providerId, performance.now());
     log.warn(`Marked ${providerId} as failed`, {
       retryAfter: `${this.FAILURE_TIMEOUT / 1000}s`,
     });
@@ -125,14 +246,55 @@ class AIService {
     }
   }
 
+  async acquireRequestSlot() {
+    if (this.activeRequests < this.MAX_CONCURRENT_REQUESTS) {
+      this.activeRequests++;
+      return;
+    }
+    // Wait for a running request to hand over its slot
+    await new Promise((resolve) => this.requestQueue.push(resolve));
+  }
+
+  releaseRequestSlot() {
+    const next = this.requestQueue.shift();
+    if (next) {
+      next();
+    } else {
+      this.activeRequests--;
+    }
+  }
+
+  async callProvider(providerId, messages, options = {}) {
+    await this.acquireRequestSlot();
+    try {
+      switch (providerId) {
+        case 'openai':
+          return await this.callOpenAI(messages, options);
+        case 'grok':
+          return await this.callGrok(messages, options);
+        case 'gemini':
+          return await this.callGemini(messages, options);
+        default:
+          throw new Error(`Unknown provider: ${providerId}`);
+      }
+    } finally {
+      this.releaseRequestSlot();
+    }
+  }
+
   async callOpenAI(messages, options = {}) {
     const apiKey = this.config?.keys?.openai;
     if (!apiKey) {
       throw new Error('OpenAI API key not configured');
     }
 
-    const openai = new OpenAI({
-      apiKey: apiKey,
+    const openai = await this.getClient('openai', apiKey, async (key) => {
+      const { default: OpenAI } = await import('openai');
+      return new OpenAI({
+        apiKey: key,
+        timeout: AI_REQUEST_TIMEOUT,
+        maxRetries: 0,
+      });
     });
 
     const completion = await openai.chat.completions.create({
@@ -151,8 +313,13 @@ class AIService {
       throw new Error('Grok API key not configured');
     }
 
-    const groq = new Groq({
-      apiKey: apiKey,
+    const groq = await this.getClient('grok', apiKey, async (key) => {
+      const { default: Groq } = await import('groq-sdk');
+      return new Groq({
+        apiKey: key,
+        timeout: AI_REQUEST_TIMEOUT,
+        maxRetries: 0,
+      });
     });
 
     const completion = await groq.chat.completions.create({
@@ -171,10 +338,14 @@ class AIService {
       throw new Error('Gemini API key not configured');
     }
 
-    const genAI = new GoogleGenerativeAI(apiKey);
-    const model = genAI.getGenerativeModel({
-      model: options.model || 'gemini-2.5-flash',
+    const genAI = await this.getClient('gemini', apiKey, async (key) => {
+      const { GoogleGenerativeAI } = await import('@google/generative-ai');
+      return new GoogleGenerativeAI(key);
     });
+    const model = genAI.getGenerativeModel(
+      { model: options.model || 'gemini-2.5-flash' },
+      { timeout: AI_REQUEST_TIMEOUT },
+    );
 
     // Convert messages format for Gemini
     // Gemini expects a single prompt string or structured content
@@ -193,11 +364,11 @@ class AIService {
 
   async callAIWithFallback(messages, options = {}) {
     // Get providers, excluding recently failed ones
-    const providers = this.getAvailableProviders();
+    const providers = await this.getAvailableProviders();
 
     if (providers.length === 0) {
       // Check if all providers are failed (but timeout hasn't passed)
-      this.reloadConfig();
+      // Config was just reloaded by getAvailableProviders
       const enabledProviders = this.config?.enabled || this.config?.order || [];
       const allProviders = enabledProviders.filter((providerId) => {
         const key = this.config?.keys?.[providerId];
@@ -205,9 +376,9 @@ class AIService {
       });
 
       if (allProviders.length > 0) {
-        const failedCount = Array.from(this.failedProviders.keys()).length;
+        const failedCount = this.failedProviders.size;
         if (failedCount > 0) {
-          const now = Date.now();
+          const now = performance.now();
           const failedList = Array.from(this.failedProviders.entries())
             .map(([id, timestamp]) => {
               const timeLeft = Math.ceil(
@@ -228,26 +399,32 @@ class AIService {
       );
     }
 
+    const cacheKey = this.getResponseCacheKey(messages, options, providers);
+    const cachedResponse = this.getCachedResponse(cacheKey);
+    if (cachedResponse !== undefined) {
+      log.info('Identical AI request is pending or recent, reusing it');
+      return cachedResponse;
+    }
+
+    const response = this.callProviders(providers, messages, options);
+    this.setCachedResponse(cacheKey, response);
+    return response;
+  }
+
+  /**
+   * Try each provider in order until one answers
+   */
+  async callProviders(providers, messages, options) {
     let lastError = null;
 
     for (const providerId of providers) {
       try {
-        log.debug(`Trying AI provider: ${providerId}`);
-        let response;
-
-        switch (providerId) {
-          case 'openai':
-            response = await this.callOpenAI(messages, options);
-            break;
-          case 'grok':
-            response = await this.callGrok(messages, options);
-            break;
-          case 'gemini':
-            response = await this.callGemini(messages, options);
-            break;
-          default:
-            throw new Error(`Unknown provider: ${providerId}`);
-        }
+        log.debug('Trying AI provider', { providerId });
+        const response = await this.callProvider(
+          providerId,
+          messages,
+          options,
+        );
 
         // Mark provider as successful (clear any failed status)
         this.markProviderAsSuccess(providerId);
@@ -275,21 +452,29 @@ class AIService {
     );
   }
 
-  readPromptFromFile(promptType = 'system') {
+  /**
+   * Read a prompt file from prompts/, trimmed
+   * Contents are memoized and only re-read when the file's mtime changes,
+   * so edits still take effect without a restart
+   */
+  async readPromptFile(filename) {
+    const promptPath = path.join(process.cwd(), 'prompts', filename);
+    const { mtimeMs } = await fs.promises.stat(promptPath);
+
+    const cached = this.promptCache.get(filename);
+    if (cached && cached.mtimeMs === mtimeMs) {
+      return cached.content;
+    }
+
+    const content = (await fs.promises.readFile(promptPath, 'utf8')).trim();
+    this.promptCache.set(filename, { mtimeMs, content });
+    return content;
+  }
+
+  async readPromptFromFile(promptType = 'system') {
     try {
-      // Map prompt types to filenames
-      const promptFileMap = {
-        system: 'system-prompt.txt',
-        context: 'context-prompt.txt',
-        transcription: 'transcription-prompt.txt',
-        debug: 'debug-prompt.txt',
-        coding: 'coding-prompt.txt',
-        theory: 'theory-prompt.txt',
-      };
-
-      const filename = promptFileMap[promptType] || 'system-prompt.txt';
-      const promptPath = path.join(process.cwd(), 'prompts', filename);
-      return fs.readFileSync(promptPath, 'utf8').trim();
+      const filename = PROMPT_FILES[promptType] || 'system-prompt.txt';
+      return await this.readPromptFile(filename);
     } catch (err) {
       log.warn(
         `Could not read prompt file (${promptType}), using default prompt`,
@@ -298,26 +483,14 @@ class AIService {
     }
   }
 
-  readContextPromptFromFile(context, promptType = 'context') {
+  async readContextPromptFromFile(context, promptType = 'context') {
     try {
-      // Map prompt types to filenames
-      const promptFileMap = {
-        system: 'system-prompt.txt',
-        context: 'context-prompt.txt',
-        transcription: 'transcription-prompt.txt',
-        debug: 'debug-prompt.txt',
-        coding: 'coding-prompt.txt',
-        theory: 'theory-prompt.txt',
-      };
-
-      const filename = promptFileMap[promptType] || 'context-prompt.txt';
-      const promptPath = path.join(process.cwd(), 'prompts', filename);
-      let contextPrompt = fs.readFileSync(promptPath, 'utf8').trim();
-      contextPrompt = contextPrompt.replace(
+      const filename = PROMPT_FILES[promptType] || 'context-prompt.txt';
+      const contextPrompt = await this.readPromptFile(filename);
+      return contextPrompt.replace(
         '{CONTEXT}',
         context || 'No previous context available',
       );
-      return contextPrompt;
     } catch (err) {
       log.warn(
         `Could not read context prompt file (${promptType}), using default prompt`,
@@ -326,21 +499,10 @@ class AIService {
     }
   }
 
-  readTranscriptionPromptFromFile(promptType = 'transcription') {
+  async readTranscriptionPromptFromFile(promptType = 'transcription') {
     try {
-      // Map prompt types to filenames
-      const promptFileMap = {
-        system: 'system-prompt.txt',
-        context: 'context-prompt.txt',
-        transcription: 'transcription-prompt.txt',
-        debug: 'debug-prompt.txt',
-        coding: 'coding-prompt.txt',
-        theory: 'theory-prompt.txt',
-      };
-
-      const filename = promptFileMap[promptType] || 'transcription-prompt.txt';
-      const promptPath = path.join(process.cwd(), 'prompts', filename);
-      return fs.readFileSync(promptPath, 'utf8').trim();
+      const filename = PROMPT_FILES[promptType] || 'transcription-prompt.txt';
+      return await this.readPromptFile(filename);
     } catch (err) {
       log.warn(
         `Could not read transcription prompt file (${promptType}), using default prompt`,
@@ -350,8 +512,7 @@ class AIService {
   }
 
   async askGpt(text, promptType = null) {
-    this.reloadConfig();
-    const systemPrompt = this.readPromptFromFile(promptType || 'system');
+    const systemPrompt = await this.readPromptFromFile(promptType || 'system');
 
     const messages = [
       {
@@ -364,15 +525,11 @@ class AIService {
       },
     ];
 
-    return await this.callAIWithFallback(messages, {
-      temperature: 0.7,
-      max_tokens: 2048,
-    });
+    return await this.callAIWithFallback(messages, DEFAULT_COMPLETION_OPTIONS);
   }
 
   async askGptWithContext(text, previousResponse, promptType = null) {
-    this.reloadConfig();
-    const systemPrompt = this.readContextPromptFromFile(
+    const systemPrompt = await this.readContextPromptFromFile(
       previousResponse,
       promptType || 'context',
     );
@@ -388,15 +545,10 @@ class AIService {
       },
     ];
 
-    return await this.callAIWithFallback(messages, {
-      temperature: 0.7,
-      max_tokens: 2048,
-    });
+    return await this.callAIWithFallback(messages, DEFAULT_COMPLETION_OPTIONS);
   }
 
   async askGptQuestion(question) {
-    this.reloadConfig();
-
     const prompt = `Answer this technical question clearly and comprehensively.
 
 If the question is about programming:
@@ -424,15 +576,11 @@ Question: ${question}`;
       },
     ];
 
-    return await this.callAIWithFallback(messages, {
-      temperature: 0.7,
-      max_tokens: 2048,
-    });
+    return await this.callAIWithFallback(messages, DEFAULT_COMPLETION_OPTIONS);
   }
 
   async askGptTranscription(transcriptionText, promptType = null) {
-    this.reloadConfig();
-    const systemPrompt = this.readTranscriptionPromptFromFile(
+    const systemPrompt = await this.readTranscriptionPromptFromFile(
       promptType || 'transcription',
     );
 
@@ -447,10 +595,7 @@ Question: ${question}`;
       },
     ];
 
-    return await this.callAIWithFallback(messages, {
-      temperature: 0.7,
-      max_tokens: 2048,
-    });
+    return await this.callAIWithFallback(messages, DEFAULT_COMPLETION_OPTIONS);
   }
 }
 
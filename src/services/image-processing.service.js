@@ -1,6 +1,7 @@
 import ocrService from './ocr.service.js';
 import aiService from './ai.service.js';
 import dotenv from 'dotenv';
+import { CONFIG } from '../config/constants.js';
 import logger from '../utils/logger.js';
 
 dotenv.config();
@@ -41,6 +42,13 @@ class ImageProcessingService {
 
   addProcessedData(data) {
     this.processedData.push(data);
+    // Drop the oldest entries so history can't grow without bound
+    if (this.processedData.length > CONFIG.MAX_PROCESSED_ITEMS) {
+      this.processedData.splice(
+        0,
+        this.processedData.length - CONFIG.MAX_PROCESSED_ITEMS,
+      );
+    }
     // COMMENTED OUT: Frontend removed - no longer needed
     // // Notify WebSocket clients about the new data
     // this.dataHandlers.forEach((handler) => {
@@ -50,11 +58,15 @@ class ImageProcessingService {
     // });
   }
 
-  async processImage(imagePath, filename, useContext = false) {
+  /**
+   * Run OCR and AI processing on an image file path or an in-memory buffer
+   */
+  async processImage(image, filename, useContext = false) {
+    const imagePath = typeof image === 'string' ? image : null;
     const processId = `process-${Date.now()}-${Math.random()
       .toString(36)
-      .substr(2, 9)}`;
-    const startTime = Date.now();
+      .slice(2, 11)}`;
+    const startTime = performance.now();
 
     try {
       log.info('Starting image processing', {
@@ -78,11 +90,10 @@ class ImageProcessingService {
         }
       });
 
-      const ocrStartTime = Date.now();
+      const ocrStartTime = performance.now();
       // Image is already cropped by screenshot monitor if coordinates were received
-      // Pass null for coordinates since cropping is handled before this step
-      const extractedText = await ocrService.extractText(imagePath, null);
-      const ocrDuration = Date.now() - ocrStartTime;
+      const extractedText = await ocrService.extractText(image);
+      const ocrDuration = Math.round(performance.now() - ocrStartTime);
 
       // Emit OCR complete event
       this.dataHandlers.forEach((handler) => {
@@ -91,6 +102,28 @@ class ImageProcessingService {
         }
       });
 
+      // Skip the AI call entirely when the screenshot has no readable text
+      if (extractedText.trim().length === 0) {
+        log.info('OCR found no text in image, skipping AI processing', {
+          processId,
+          filename,
+          ocrDuration: `${ocrDuration}ms`,
+        });
+
+        this.dataHandlers.forEach((handler) => {
+          if (handler && handler.emitAISkipped) {
+            handler.emitAISkipped(filename);
+          }
+        });
+
+        return {
+          success: true,
+          extractedText,
+          gptResponse: null,
+          usedContext: false,
+        };
+      }
+
       log.info('OCR completed, starting AI processing', {
         processId,
         filename,
@@ -106,7 +139,7 @@ class ImageProcessingService {
         }
       });
 
-      const aiStartTime = Date.now();
+      const aiStartTime = performance.now();
       let gptResponse;
 
       // Always use default 'system' prompt for initial screenshot processing
@@ -134,13 +167,13 @@ class ImageProcessingService {
         gptResponse = await aiService.askGpt(extractedText, 'system');
       }
 
-      const aiDuration = Date.now() - aiStartTime;
+      const aiDuration = Math.round(performance.now() - aiStartTime);
       const provider = gptResponse.provider || 'unknown';
 
       // Generate messageId for this processing
       const messageId = `msg-${Date.now()}-${Math.random()
         .toString(36)
-        .substr(2, 9)}`;
+        .slice(2, 11)}`;
 
       // Store question (extracted text) and answer (AI response) with messageId
       // Try to get socketId from any active socket (for pending prompts)
@@ -150,7 +183,7 @@ class ImageProcessingService {
           // Get first active socket if available
           const sockets = handler.namespace.sockets;
           if (sockets && sockets.size > 0) {
-            socketIdForMessage = Array.from(sockets.keys())[0];
+            socketIdForMessage = sockets.keys().next().value;
           }
         }
         if (handler && handler.storeMessageData) {
@@ -180,7 +213,7 @@ class ImageProcessingService {
 
       this.lastResponse = gptResponse.message.content;
 
-      const totalDuration = Date.now() - startTime;
+      const totalDuration = Math.round(performance.now() - startTime);
       log.info('Image processing completed successfully', {
         processId,
         filename,
@@ -203,7 +236,7 @@ class ImageProcessingService {
         usedContext: actuallyUsedContext,
       };
 
-      this.processedData.push(processedItem);
+      this.addProcessedData(processedItem);
 
       // COMMENTED OUT: Frontend removed - no longer needed
       // // Notify WebSocket clients about the new data
@@ -250,7 +283,7 @@ class ImageProcessingService {
         usedContext: false,
         type: 'image',
       };
-      this.processedData.push(errorItem);
+      this.addProcessedData(errorItem);
 
       // COMMENTED OUT: Frontend removed - no longer needed
       // // Notify WebSocket clients about the error data
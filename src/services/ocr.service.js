@@ -2,6 +2,7 @@ import Tesseract from 'tesseract.js';
 import sharp from 'sharp';
 import path from 'path';
 import fs from 'fs';
+import crypto from 'crypto';
 import { fileURLToPath } from 'url';
 import logger from '../utils/logger.js';
 
@@ -10,146 +11,181 @@ const __dirname = path.dirname(__filename);
 
 const log = logger('OCRService');
 
+// Maximum number of OCR results kept in the content-hash cache
+const OCR_CACHE_MAX_ENTRIES = 128;
+// Number of Tesseract workers; jobs are spread across them so concurrent
+// uploads and screenshots run on separate cores
+const OCR_WORKERS = parseInt(process.env.OCR_WORKERS, 10) || 2;
+// Optional Tesseract page segmentation mode (e.g. 6 = single text block).
+// Narrower modes skip layout analysis, which is much of the cost on dense
+// screenshots; unset keeps Tesseract's automatic segmentation
+const OCR_PSM = process.env.OCR_PSM || null;
+// Optional cap on libvips threads per sharp operation. sharp defaults to one
+// per core; a lower value leaves cores free for the Tesseract workers
+const SHARP_CONCURRENCY = parseInt(process.env.SHARP_CONCURRENCY, 10) || 0;
+// Optional blank-image tolerance. Unset, only a perfectly uniform image
+// (every channel min === max) skips OCR; a mostly white screenshot with one
+// short line of text can have a channel stdev below 1, so any tolerance must
+// stay very close to 0. Set, channels with a stdev below it count as blank;
+// 0 turns the check off
+const OCR_BLANK_STDEV = Number.isNaN(parseFloat(process.env.OCR_BLANK_STDEV))
+  ? null
+  : parseFloat(process.env.OCR_BLANK_STDEV);
+
+if (SHARP_CONCURRENCY > 0) {
+  sharp.concurrency(SHARP_CONCURRENCY);
+}
+
 class OCRService {
-  async extractText(imagePath, coordinates = null) {
+  constructor() {
+    this.schedulerPromise = null;
+    // Cache of OCR results keyed by image content hash
+    // Map insertion order is used for LRU eviction
+    this.resultCache = new Map();
+  }
+
+  /**
+   * Get the shared Tesseract scheduler, creating its workers on first use
+   * Loading the language data dominates short OCR jobs, so the workers are
+   * kept alive and reused instead of being recreated for every image
+   */
+  getScheduler() {
+    if (!this.schedulerPromise) {
+      this.schedulerPromise = this.createScheduler().catch((err) => {
+        // Allow the next call to retry worker creation
+        this.schedulerPromise = null;
+        throw err;
+      });
+    }
+    return this.schedulerPromise;
+  }
+
+  async createScheduler() {
+    const scheduler = Tesseract.createScheduler();
+    const workers = await Promise.all(
+      Array.from({ length: OCR_WORKERS }, () => Tesseract.createWorker('eng')),
+    );
+    if (OCR_PSM) {
+      await Promise.all(
+        workers.map((worker) =>
+          worker.setParameters({ tessedit_pageseg_mode: OCR_PSM }),
+        ),
+      );
+    }
+    workers.forEach((worker) => scheduler.addWorker(worker));
+    log.info('OCR workers ready', { workers: OCR_WORKERS, psm: OCR_PSM });
+    return scheduler;
+  }
+
+  /**
+   * Build the result cache key from the image content
+   * WebCrypto digests on the libuv threadpool, so hashing a multi-megabyte
+   * screenshot does not block the event loop
+   */
+  async getCacheKey(imageBuffer) {
+    const digest = await crypto.webcrypto.subtle.digest('SHA-256', imageBuffer);
+    return Buffer.from(digest).toString('hex');
+  }
+
+  getCachedResult(cacheKey) {
+    const text = this.resultCache.get(cacheKey);
+    if (text !== undefined) {
+      // Refresh LRU position
+      this.resultCache.delete(cacheKey);
+      this.resultCache.set(cacheKey, text);
+    }
+    return text;
+  }
+
+  setCachedResult(cacheKey, text) {
+    this.resultCache.set(cacheKey, text);
+    if (this.resultCache.size > OCR_CACHE_MAX_ENTRIES) {
+      // Evict least recently used entry
+      const oldestKey = this.resultCache.keys().next().value;
+      this.resultCache.delete(oldestKey);
+    }
+  }
+
+  /**
+   * Extract text from an image file path or an in-memory image buffer
+   * Region selection happens before this step (ScreenshotMonitor.cropImage),
+   * so the whole image is always recognised
+   */
+  async extractText(image) {
     try {
-      const startTime = Date.now();
-      let imageToProcess = imagePath;
-      let croppedImagePath = null;
-
-      // If coordinates provided, crop the image first
-      if (coordinates) {
-        log.info('Cropping image to specified region');
-
-        try {
-          // Get screenshot dimensions to calculate scaling factor
-          const imageMetadata = await sharp(imagePath).metadata();
-          const screenshotWidth = imageMetadata.width;
-          const screenshotHeight = imageMetadata.height;
-
-          // Get screen dimensions using systeminformation
-          const si = await import('systeminformation');
-          const graphics = await si.default.graphics();
-
-          // Find primary display (usually first one)
-          const primaryDisplay = graphics.displays && graphics.displays[0];
-          // Use current resolution if available, otherwise use max resolution
-          let screenWidth =
-            primaryDisplay?.currentResX || primaryDisplay?.resolutionX;
-          let screenHeight =
-            primaryDisplay?.currentResY || primaryDisplay?.resolutionY;
-
-          // If screen dimensions not available, try to infer from screenshot
-          // On Retina displays, screenshots are typically 2x resolution
-          if (!screenWidth || !screenHeight) {
-            // Assume Retina (2x) if screenshot is very large
-            const likelyRetina =
-              screenshotWidth > 2000 || screenshotHeight > 2000;
-            screenWidth = likelyRetina ? screenshotWidth / 2 : screenshotWidth;
-            screenHeight = likelyRetina
-              ? screenshotHeight / 2
-              : screenshotHeight;
-            log.warn(
-              'Screen dimensions not available, inferring from screenshot',
-              {
-                inferredWidth: screenWidth,
-                inferredHeight: screenHeight,
-                likelyRetina,
-              },
-            );
-          }
-
-          // Calculate scaling factor
-          // On Retina displays, screenshot is typically 2x the logical screen size
-          // Example: Screenshot 2880×1800, Display 1440×900 → scaleFactor = 2.0
-          let scaleFactor = screenshotWidth / screenWidth;
-
-          // Also check Y scale factor to ensure consistency
-          const scaleFactorY = screenshotHeight / screenHeight;
-
-          // Use the average if they differ slightly, or log a warning
-          if (Math.abs(scaleFactor - scaleFactorY) > 0.1) {
-            log.warn('X and Y scale factors differ significantly', {
-              scaleFactorX: scaleFactor,
-              scaleFactorY: scaleFactorY,
-            });
-            // Use average for consistency
-            scaleFactor = (scaleFactor + scaleFactorY) / 2;
-          }
-
-          // Validate scale factor (should be between 1 and 4 typically)
-          if (scaleFactor < 0.5 || scaleFactor > 4) {
-            log.warn('Unusual scale factor detected', {
-              scaleFactor: scaleFactor.toFixed(2),
-            });
-          }
-
-          // Scale coordinates to match screenshot resolution
-          const scaledX = coordinates.x * scaleFactor;
-          const scaledY = coordinates.y * scaleFactor;
-          const scaledWidth = coordinates.width * scaleFactor;
-          const scaledHeight = coordinates.height * scaleFactor;
-
-          // Round to integers (sharp requires integers)
-          let x = Math.round(scaledX);
-          let y = Math.round(scaledY);
-          let w = Math.round(scaledWidth);
-          let h = Math.round(scaledHeight);
-
-          // Validate and clamp coordinates to image bounds
-          x = Math.max(0, Math.min(x, screenshotWidth - 1));
-          y = Math.max(0, Math.min(y, screenshotHeight - 1));
-          w = Math.max(1, Math.min(w, screenshotWidth - x));
-          h = Math.max(1, Math.min(h, screenshotHeight - y));
-
-          // Create cropped image path with coordinates in filename for inspection
-          const originalDir = path.dirname(imagePath);
-          const originalName = path.basename(
-            imagePath,
-            path.extname(imagePath),
-          );
-          const ext = path.extname(imagePath);
-          croppedImagePath = path.join(
-            originalDir,
-            `${originalName}_cropped_x${x}_y${y}_w${w}_h${h}${ext}`,
-          );
-
-          // Crop image using sharp with validated coordinates
-          await sharp(imagePath)
-            .extract({
-              left: x,
-              top: y,
-              width: w,
-              height: h,
-            })
-            .toFile(croppedImagePath);
-
-          imageToProcess = croppedImagePath;
-          log.info('Image cropped successfully');
-        } catch (cropError) {
-          log.error('Error cropping image, using full image', cropError);
-          // Fall back to full image if cropping fails
-          imageToProcess = imagePath;
-        }
+      const startTime = performance.now();
+      // Read the image once: used for the cache key and fed to Tesseract
+      const imageBuffer = Buffer.isBuffer(image)
+        ? image
+        : await fs.promises.readFile(image);
+      const cacheKey = await this.getCacheKey(imageBuffer);
+
+      const cachedText = this.getCachedResult(cacheKey);
+      if (cachedText !== undefined) {
+        log.info('OCR cache hit, skipping extraction', {
+          textLength: cachedText.length,
+        });
+        return cachedText;
+      }
+
+      // A solid-colour image cannot contain text; a stats pass is far cheaper
+      // than a Tesseract recognition
+      if (await this.isBlankImage(imageBuffer)) {
+        log.info('Image is blank, skipping OCR');
+        this.setCachedResult(cacheKey, '');
+        return '';
       }
 
-      // Run OCR on the image (cropped or full)
-      const textData = await Tesseract.recognize(imageToProcess, 'eng');
-      const duration = Date.now() - startTime;
+      const scheduler = await this.getScheduler();
+      const textData = await scheduler.addJob('recognize', imageBuffer);
+      const duration = Math.round(performance.now() - startTime);
 
       log.info('OCR extraction complete', {
         textLength: textData.data.text.length,
         confidence: textData.data.confidence || 0,
         duration: `${duration}ms`,
-        usedRegion: coordinates !== null,
       });
 
+      this.setCachedResult(cacheKey, textData.data.text);
+
       return textData.data.text;
     } catch (err) {
       log.error('Error extracting text from image', err);
       throw err;
     }
   }
+
+  /**
+   * Check whether an image is a single solid colour (see OCR_BLANK_STDEV)
+   * Errors fall through to OCR, which reports them itself
+   */
+  async isBlankImage(imageBuffer) {
+    if (OCR_BLANK_STDEV === 0) {
+      return false;
+    }
+    try {
+      const { channels } = await sharp(imageBuffer).stats();
+      return channels.every((channel) =>
+        OCR_BLANK_STDEV === null
+          ? channel.min === channel.max
+          : channel.stdev < OCR_BLANK_STDEV,
+      );
+    } catch (err) {
+      return false;
+    }
+  }
+
+  /**
+   * Terminate the Tesseract workers, if they were started
+   */
+  async terminate() {
+    if (!this.schedulerPromise) {
+      return;
+    }
+    const scheduler = await this.schedulerPromise;
+    this.schedulerPromise = null;
+    await scheduler.terminate();
+  }
 }
 
 export default new OCRService();
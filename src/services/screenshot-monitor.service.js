@@ -3,6 +3,7 @@ import path from 'path';
 import imageProcessingService from './image-processing.service.js';
 import { CONFIG } from '../config/constants.js';
 import logger from '../utils/logger.js';
+import { getPrimaryDisplaySize } from '../utils/display.js';
 import createMouse from 'osx-mouse';
 import sharp from 'sharp';
 
@@ -10,9 +11,11 @@ const log = logger('ScreenshotMonitor');
 
 class ScreenshotMonitorService {
   constructor() {
-    this.blacklistedShots = [...CONFIG.BLACKLISTED_FILES];
+    this.blacklistedShots = new Set(CONFIG.BLACKLISTED_FILES);
     this.watcher = null;
     this.processingFiles = new Set(); // Track files currently being processed
+    this.pendingFileChecks = new Map(); // filename -> debounce timer handle
+    this.clickCapture = Promise.resolve(); // Tail of the click-capture chain
   }
 
   /**
@@ -183,21 +186,20 @@ class ScreenshotMonitorService {
 
   /**
    * Crop image using coordinates
-   * Returns path to cropped image or null if cropping fails
+   * Returns { buffer, filename } for the cropped region, kept in memory,
+   * or null if cropping fails
    */
   async cropImage(imagePath, coordinates) {
     try {
-      const imageMetadata = await sharp(imagePath).metadata();
+      // One sharp instance serves both the metadata read and the crop
+      const image = sharp(imagePath);
+      const imageMetadata = await image.metadata();
       const screenshotWidth = imageMetadata.width;
       const screenshotHeight = imageMetadata.height;
 
-      const si = await import('systeminformation');
-      const graphics = await si.default.graphics();
-      const primaryDisplay = graphics.displays && graphics.displays[0];
-      let screenWidth =
-        primaryDisplay?.currentResX || primaryDisplay?.resolutionX;
-      let screenHeight =
-        primaryDisplay?.currentResY || primaryDisplay?.resolutionY;
+      const display = await getPrimaryDisplaySize();
+      let screenWidth = display.width;
+      let screenHeight = display.height;
 
       if (!screenWidth || !screenHeight) {
         const likelyRetina = screenshotWidth > 2000 || screenshotHeight > 2000;
@@ -226,26 +228,38 @@ class ScreenshotMonitorService {
       w = Math.max(1, Math.min(w, screenshotWidth - x));
       h = Math.max(1, Math.min(h, screenshotHeight - y));
 
-      const originalDir = path.dirname(imagePath);
       const originalName = path.basename(imagePath, path.extname(imagePath));
       const ext = path.extname(imagePath);
-      const croppedImagePath = path.join(
-        originalDir,
-        `${originalName}_cropped_x${x}_y${y}_w${w}_h${h}${ext}`,
-      );
+      const croppedFilename = `${originalName}_cropped_x${x}_y${y}_w${w}_h${h}${ext}`;
 
-      await sharp(imagePath)
+      // Greyscale in the same libvips pass so Tesseract skips the conversion
+      const buffer = await image
         .extract({ left: x, top: y, width: w, height: h })
-        .toFile(croppedImagePath);
+        .greyscale()
+        .toBuffer();
 
-      log.info('Image cropped successfully', { croppedPath: croppedImagePath });
-      return croppedImagePath;
+      log.info('Image cropped successfully', { croppedFilename });
+      return { buffer, filename: croppedFilename };
     } catch (error) {
       log.error('Error cropping image', { error: error.message });
       return null;
     }
   }
 
+  /**
+   * Wait for region-selection clicks, one screenshot at a time
+   * Each capture opens its own mouse stream, so two screenshots listening
+   * at once would both receive the same clicks. Captures are chained in
+   * arrival order; cropping, OCR and AI still run concurrently
+   */
+  captureCoordinates(timeoutMs = 2000) {
+    const capture = this.clickCapture.then(() =>
+      this.waitForCoordinates(timeoutMs),
+    );
+    this.clickCapture = capture.catch(() => null);
+    return capture;
+  }
+
   clearScreenshotsDirectory() {
     try {
       if (!fs.existsSync(CONFIG.SCREENSHOTS_PATH)) {
@@ -274,7 +288,7 @@ class ScreenshotMonitorService {
           // Check if it's a file (not a directory)
           const stats = fs.statSync(filePath);
           if (!stats.isFile()) {
-            log.debug(`Skipping non-file: ${file}`);
+            log.debug('Skipping non-file', { file });
             skippedCount++;
             return;
           }
@@ -282,7 +296,7 @@ class ScreenshotMonitorService {
           // Delete all files (including cropped images)
           fs.unlinkSync(filePath);
           clearedCount++;
-          log.debug(`Deleted file: ${file}`);
+          log.debug('Deleted file', { file });
         } catch (err) {
           log.error(`Error deleting file ${file}`, {
             error: err.message,
@@ -316,13 +330,13 @@ class ScreenshotMonitorService {
     // Skip if already processing, blacklisted, or is a cropped image
     if (
       this.processingFiles.has(filename) ||
-      this.blacklistedShots.includes(filename) ||
+      this.blacklistedShots.has(filename) ||
       filename.includes('_cropped_')
     ) {
       return;
     }
 
-    this.blacklistedShots.push(filename);
+    this.blacklistedShots.add(filename);
     this.processingFiles.add(filename);
 
     const filePath = `${CONFIG.SCREENSHOTS_PATH}/${filename}`;
@@ -333,10 +347,8 @@ class ScreenshotMonitorService {
     });
 
     try {
-      // Small delay to ensure file is fully written to disk
-      await new Promise((resolve) => setTimeout(resolve, 100));
-
-      // Verify file exists and is readable before processing
+      // The watcher debounce already waited for writes to settle; only check
+      // the file is still there
       try {
         await fs.promises.access(
           filePath,
@@ -351,7 +363,7 @@ class ScreenshotMonitorService {
       }
 
       // Wait 2 seconds for mouse clicks to capture coordinates
-      const coordinates = await this.waitForCoordinates(2000);
+      const coordinates = await this.captureCoordinates(2000);
 
       let imageToProcess = filePath;
       let filenameToProcess = filename;
@@ -359,14 +371,12 @@ class ScreenshotMonitorService {
       // If coordinates received, crop the image first
       if (coordinates) {
         log.info('Coordinates received, cropping image before processing');
-        const croppedImagePath = await this.cropImage(filePath, coordinates);
-
-        if (croppedImagePath) {
-          // Use cropped image for processing
-          imageToProcess = croppedImagePath;
-          filenameToProcess = path.basename(croppedImagePath);
-          // Blacklist the cropped image so it's not processed again
-          this.blacklistedShots.push(filenameToProcess);
+        const croppedImage = await this.cropImage(filePath, coordinates);
+
+        if (croppedImage) {
+          // Process the cropped region straight from memory
+          imageToProcess = croppedImage.buffer;
+          filenameToProcess = croppedImage.filename;
           log.info('Will process cropped image only, original skipped', {
             original: filename,
             cropped: filenameToProcess,
@@ -391,11 +401,10 @@ class ScreenshotMonitorService {
       const dataHandlers = imageProcessingService.dataHandlers || [];
       for (const handler of dataHandlers) {
         if (handler && handler.pendingPrompts) {
-          // Check all sockets for pending prompts
-          const pendingSockets = Array.from(handler.pendingPrompts.keys());
-          for (const socketId of pendingSockets) {
-            const pendingPrompt = handler.getPendingPrompt(socketId);
-            if (pendingPrompt && pendingPrompt.screenshotRequired) {
+          // Check all sockets for pending prompts; the loop stops at the
+          // first match, so iterating the live map needs no snapshot
+          for (const [socketId, pendingPrompt] of handler.pendingPrompts) {
+            if (pendingPrompt.screenshotRequired) {
               log.info('Found pending prompt for screenshot', {
                 socketId,
                 messageId: pendingPrompt.messageId,
@@ -435,6 +444,52 @@ class ScreenshotMonitorService {
     }
   }
 
+  /**
+   * Debounce watcher events per file
+   * fs.watch fires several 'rename' events while a screenshot is being
+   * written; each one re-arms the same timer instead of queueing another
+   * check, so a file is checked once, 200ms after its last event
+   */
+  scheduleFileCheck(filename) {
+    const pendingCheck = this.pendingFileChecks.get(filename);
+    if (pendingCheck) {
+      clearTimeout(pendingCheck);
+    }
+
+    const timeoutHandle = setTimeout(() => {
+      this.pendingFileChecks.delete(filename);
+      this.checkNewFile(filename);
+    }, 200); // 200ms delay to ensure file is fully written
+
+    this.pendingFileChecks.set(filename, timeoutHandle);
+  }
+
+  checkNewFile(filename) {
+    const filePath = path.join(CONFIG.SCREENSHOTS_PATH, filename);
+
+    fs.access(filePath, fs.constants.F_OK | fs.constants.R_OK, (err) => {
+      if (err) {
+        return;
+      }
+
+      // Skip cropped images - crops are processed in memory, but the
+      // directory may still hold _cropped_ files written by older versions
+      if (filename.includes('_cropped_')) {
+        log.debug('Skipping cropped image file', { filename });
+        return;
+      }
+
+      // File exists and is readable, process it
+      this.processScreenshot(filename).catch((error) => {
+        log.error('Error in processScreenshot', {
+          filename,
+          error: error.message,
+          stack: error.stack,
+        });
+      });
+    });
+  }
+
   setupDirectoryWatcher() {
     try {
       // Ensure directory exists
@@ -453,33 +508,7 @@ class ScreenshotMonitorService {
           // Only process on 'rename' events (file created/moved)
           // Note: Some platforms use 'rename' for both create and delete
           if (eventType === 'rename') {
-            const filePath = path.join(CONFIG.SCREENSHOTS_PATH, filename);
-
-            // Small delay to ensure file is fully written, then check if it exists
-            setTimeout(() => {
-              fs.access(
-                filePath,
-                fs.constants.F_OK | fs.constants.R_OK,
-                (err) => {
-                  if (!err) {
-                    // Skip cropped images - they're temporary files created during processing
-                    if (filename.includes('_cropped_')) {
-                      log.debug('Skipping cropped image file', { filename });
-                      return;
-                    }
-
-                    // File exists and is readable, process it
-                    this.processScreenshot(filename).catch((error) => {
-                      log.error('Error in processScreenshot', {
-                        filename,
-                        error: error.message,
-                        stack: error.stack,
-                      });
-                    });
-                  }
-                },
-              );
-            }, 200); // 200ms delay to ensure file is fully written
+            this.scheduleFileCheck(filename);
           }
         },
       );
@@ -510,6 +539,11 @@ class ScreenshotMonitorService {
   }
 
   stop() {
+    this.pendingFileChecks.forEach((timeoutHandle) =>
+      clearTimeout(timeoutHandle),
+    );
+    this.pendingFileChecks.clear();
+
     if (this.watcher) {
       this.watcher.close();
       this.watcher = null;
@@ -23,17 +23,57 @@ const log = logger('DataHandler');
 const VALID_PROMPT_TYPES = ['debug', 'theory', 'coding'];
 const DEFAULT_PROMPT_TYPE = 'transcription'; // Default for transcription flow
 const SCREENSHOT_PROMPT_TYPE = 'system'; // Default for screenshot flow
+const MAX_TRANSCRIPTION_CHUNKS = 1000; // Per socket, oldest dropped beyond this
+const MAX_MESSAGE_DATA_ENTRIES = 200; // Stored question/answer pairs, oldest evicted
+const MESSAGE_DATA_TTL = 30 * 60 * 1000; // Stored pairs expire after 30 minutes
+const MESSAGE_DATA_SWEEP_INTERVAL = 60 * 1000;
+
+// Fixed status payloads, shared across emits
+const OCR_STARTED_PAYLOAD = Object.freeze({ message: 'OCR started' });
+const OCR_COMPLETE_PAYLOAD = Object.freeze({ message: 'OCR completed' });
+const AI_STARTED_PAYLOAD = Object.freeze({ message: 'AI processing started' });
+const AI_SKIPPED_PAYLOAD = Object.freeze({
+  message: 'No text found, AI processing skipped',
+});
 
 class DataHandler extends EventEmitter {
   constructor(io) {
     super();
     this.io = io;
     this.namespace = null;
-    this.transcriptionChunks = new Map(); // Store transcription chunks per socket connection
+    this.transcriptionChunks = new Map(); // Store transcription chunks per socket connection: socketId -> {chunks, head}
     this.selectedPrompts = new Map(); // Store selected prompt type per socket connection
     this.messageData = new Map(); // Store messageId -> {question, answer, promptType, socketId, timestamp}
     this.pendingPrompts = new Map(); // Store pending prompts waiting for screenshots: socketId -> {promptType, messageId, screenshotRequired, question, answer}
+    this.chunkLimitWarned = new Set(); // Sockets already warned about the chunk limit
+    // Per-socket maps cleared on disconnect (built once, not per disconnect)
+    this.socketDataMaps = [
+      {
+        map: this.transcriptionChunks,
+        name: 'transcription chunks',
+      },
+      {
+        map: this.selectedPrompts,
+        name: 'selected prompt',
+      },
+      {
+        map: this.pendingPrompts,
+        name: 'pending prompt',
+      },
+      {
+        map: this.chunkLimitWarned,
+        name: 'chunk limit warning',
+      },
+    ];
     this.setupNamespace();
+
+    // Periodically drop expired message data; unref'd so it never keeps
+    // the process alive on its own
+    this.messageDataSweepTimer = setInterval(
+      () => this.sweepExpiredMessageData(),
+      MESSAGE_DATA_SWEEP_INTERVAL,
+    );
+    this.messageDataSweepTimer.unref();
   }
 
   setupNamespace() {
@@ -93,24 +133,8 @@ class DataHandler extends EventEmitter {
    * Clean up all data associated with a socket
    */
   cleanupSocketData(socketId) {
-    const cleanupActions = [
-      {
-        map: this.transcriptionChunks,
-        name: 'transcription chunks',
-      },
-      {
-        map: this.selectedPrompts,
-        name: 'selected prompt',
-      },
-      {
-        map: this.pendingPrompts,
-        name: 'pending prompt',
-      },
-    ];
-
-    cleanupActions.forEach(({ map, name }) => {
-      if (map.has(socketId)) {
-        map.delete(socketId);
+    this.socketDataMaps.forEach(({ map, name }) => {
+      if (map.delete(socketId)) {
         log.info(`Cleaned up ${name} for disconnected socket`, { socketId });
       }
     });
@@ -259,7 +283,7 @@ class DataHandler extends EventEmitter {
    * Handle transcription chunk event
    */
   handleTranscription(socket, data) {
-    const { textChunk } = data || {};
+    const textChunk = this.parseTextChunk(data);
 
     if (!textChunk || typeof textChunk !== 'string') {
       log.warn('Invalid transcription chunk received', {
@@ -269,20 +293,71 @@ class DataHandler extends EventEmitter {
       return;
     }
 
-    // Initialize array if it doesn't exist for this socket
+    // Initialize buffer if it doesn't exist for this socket
     if (!this.transcriptionChunks.has(socket.id)) {
-      this.transcriptionChunks.set(socket.id, []);
+      this.transcriptionChunks.set(socket.id, { chunks: [], head: 0 });
     }
 
-    // Add chunk to the array
-    const chunks = this.transcriptionChunks.get(socket.id);
-    chunks.push(textChunk);
+    // Add chunk to the buffer
+    const buffer = this.transcriptionChunks.get(socket.id);
+    const { chunks } = buffer;
+
+    if (chunks.length < MAX_TRANSCRIPTION_CHUNKS) {
+      chunks.push(textChunk);
+    } else {
+      // Bound memory for clients that stream without ever processing: once
+      // full, the buffer is a ring and each chunk overwrites the oldest one
+      chunks[buffer.head] = textChunk;
+      buffer.head = (buffer.head + 1) % MAX_TRANSCRIPTION_CHUNKS;
+      // Warn once per batch rather than on every chunk past the limit
+      if (!this.chunkLimitWarned.has(socket.id)) {
+        this.chunkLimitWarned.add(socket.id);
+        log.warn('Transcription chunk limit reached, dropping oldest chunks', {
+          socketId: socket.id,
+          maxChunks: MAX_TRANSCRIPTION_CHUNKS,
+        });
+      }
+    }
 
-    log.debug('Transcription chunk received', {
-      socketId: socket.id,
-      chunkLength: textChunk.length,
-      totalChunks: chunks.length,
-    });
+    if (log.isEnabled('DEBUG')) {
+      log.debug('Transcription chunk received', {
+        socketId: socket.id,
+        chunkLength: textChunk.length,
+        totalChunks: chunks.length,
+      });
+    }
+  }
+
+  /**
+   * Extract the text chunk from a transcription payload
+   * Accepts a raw string or binary frame (UTF-8) as well as { textChunk }
+   */
+  parseTextChunk(data) {
+    if (typeof data === 'string') {
+      return data;
+    }
+    if (Buffer.isBuffer(data)) {
+      return data.toString('utf8');
+    }
+    return data?.textChunk;
+  }
+
+  /**
+   * Remove a socket's buffered chunks and return them oldest first
+   * Also re-arms the chunk limit warning for the next batch
+   */
+  takeTranscriptionChunks(socketId) {
+    const buffer = this.transcriptionChunks.get(socketId);
+    this.transcriptionChunks.delete(socketId);
+    this.chunkLimitWarned.delete(socketId);
+
+    if (!buffer) {
+      return [];
+    }
+    const { chunks, head } = buffer;
+    return head === 0
+      ? chunks
+      : chunks.slice(head).concat(chunks.slice(0, head));
   }
 
   /**
@@ -291,11 +366,20 @@ class DataHandler extends EventEmitter {
    * Generates messageId and stores question/answer for use_prompt functionality
    */
   async handleProcessTranscription(socket) {
-    const chunks = this.transcriptionChunks.get(socket.id);
-
-    if (!chunks || chunks.length === 0) {
-      log.warn('No transcription chunks found for processing', {
+    // Take ownership of the accumulated chunks up front, so chunks that
+    // arrive while the AI request is in flight start a new batch instead of
+    // being discarded along with this one
+    const chunks = this.takeTranscriptionChunks(socket.id);
+
+    // Combine all chunks into full transcription
+    const fullTranscription = chunks.join(' ');
+
+    // No chunks, or silence-only input (empty or whitespace chunks), is not
+    // worth an AI call
+    if (fullTranscription.trim().length === 0) {
+      log.warn('No transcription text to process', {
         socketId: socket.id,
+        chunkCount: chunks.length,
       });
       this.emitToSocket(socket, 'aiprocessing_error', {
         error: 'No transcription data available',
@@ -305,9 +389,6 @@ class DataHandler extends EventEmitter {
     }
 
     try {
-      // Combine all chunks into full transcription
-      const fullTranscription = chunks.join(' ');
-
       log.info('Processing transcription', {
         socketId: socket.id,
         chunkCount: chunks.length,
@@ -317,7 +398,7 @@ class DataHandler extends EventEmitter {
       // Emit AI processing started event
       this.emitAIStarted('transcription', fullTranscription, false);
 
-      const aiStartTime = Date.now();
+      const aiStartTime = performance.now();
 
       // Get selected prompt type for this socket (default to 'transcription')
       const promptType =
@@ -329,7 +410,7 @@ class DataHandler extends EventEmitter {
         promptType,
       );
 
-      const aiDuration = Date.now() - aiStartTime;
+      const aiDuration = Math.round(performance.now() - aiStartTime);
       const provider = aiResponse.provider || 'unknown';
       const responseContent = aiResponse.message.content;
 
@@ -363,9 +444,6 @@ class DataHandler extends EventEmitter {
       // Update last response for potential context use
       imageProcessingService.setLastResponse(responseContent);
 
-      // Clear transcription chunks after processing
-      this.transcriptionChunks.delete(socket.id);
-
       log.info('Transcription processing completed successfully', {
         socketId: socket.id,
         messageId,
@@ -390,9 +468,6 @@ class DataHandler extends EventEmitter {
         stack: err.stack,
       });
 
-      // Clear chunks even on error
-      this.transcriptionChunks.delete(socket.id);
-
       // Emit processing error event
       this.emitProcessingError('transcription', 'transcription', err);
     }
@@ -422,7 +497,7 @@ class DataHandler extends EventEmitter {
       // Emit AI processing started event
       this.emitAIStarted('prompt', question, false);
 
-      const aiStartTime = Date.now();
+      const aiStartTime = performance.now();
 
       // Build prompt text based on prompt type
       const promptText = this.buildPromptText(
@@ -435,7 +510,7 @@ class DataHandler extends EventEmitter {
       // Call AI service with appropriate prompt type
       const gptResponse = await aiService.askGpt(promptText, promptType);
 
-      const aiDuration = Date.now() - aiStartTime;
+      const aiDuration = Math.round(performance.now() - aiStartTime);
       const provider = gptResponse.provider || 'unknown';
       const responseContent = gptResponse.message.content;
 
@@ -511,7 +586,7 @@ class DataHandler extends EventEmitter {
    * Generate a unique messageId
    */
   generateMessageId() {
-    return `msg-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`;
+    return `msg-${Date.now()}-${Math.random().toString(36).slice(2, 11)}`;
   }
 
   // ==================== Message Data Management ====================
@@ -527,6 +602,11 @@ class DataHandler extends EventEmitter {
       socketId,
       timestamp: Date.now(),
     });
+    if (this.messageData.size > MAX_MESSAGE_DATA_ENTRIES) {
+      // Map iterates in insertion order, so the first key is the oldest
+      const oldestMessageId = this.messageData.keys().next().value;
+      this.messageData.delete(oldestMessageId);
+    }
     log.info('Message data stored', {
       messageId,
       questionLength: question?.length || 0,
@@ -536,6 +616,31 @@ class DataHandler extends EventEmitter {
     });
   }
 
+  /**
+   * Remove message data older than MESSAGE_DATA_TTL
+   * Entries are stored in insertion order, so the sweep stops at the first
+   * entry that is still fresh
+   */
+  sweepExpiredMessageData() {
+    const cutoff = Date.now() - MESSAGE_DATA_TTL;
+    let expiredCount = 0;
+
+    for (const [messageId, data] of this.messageData) {
+      if (data.timestamp > cutoff) {
+        break;
+      }
+      this.messageData.delete(messageId);
+      expiredCount++;
+    }
+
+    if (expiredCount > 0) {
+      log.info('Expired stored message data', {
+        expiredCount,
+        remaining: this.messageData.size,
+      });
+    }
+  }
+
   /**
    * Get message data by messageId
    */
@@ -592,7 +697,7 @@ class DataHandler extends EventEmitter {
       return;
     }
 
-    log.info('Screenshot captured', { filename });
+    log.debug('Screenshot captured', { filename });
     this.namespace.emit('screenshot_captured', {
       message: `Screenshot captured: ${filename}`,
     });
@@ -607,8 +712,8 @@ class DataHandler extends EventEmitter {
       return;
     }
 
-    log.info('OCR started');
-    this.namespace.emit('ocr_started', { message: 'OCR started' });
+    log.debug('OCR started');
+    this.namespace.emit('ocr_started', OCR_STARTED_PAYLOAD);
   }
 
   /**
@@ -620,8 +725,8 @@ class DataHandler extends EventEmitter {
       return;
     }
 
-    log.info('OCR completed', { extractedTextLength: extractedText?.length });
-    this.namespace.emit('ocr_complete', { message: 'OCR completed' });
+    log.debug('OCR completed', { extractedTextLength: extractedText?.length });
+    this.namespace.emit('ocr_complete', OCR_COMPLETE_PAYLOAD);
   }
 
   /**
@@ -633,10 +738,21 @@ class DataHandler extends EventEmitter {
       return;
     }
 
-    log.info('AI processing started');
-    this.namespace.emit('ai_processing_started', {
-      message: 'AI processing started',
-    });
+    log.debug('AI processing started');
+    this.namespace.emit('ai_processing_started', AI_STARTED_PAYLOAD);
+  }
+
+  /**
+   * Emit AI processing skipped event (OCR found no text)
+   */
+  emitAISkipped(filename) {
+    if (!this.namespace) {
+      log.warn('Namespace not initialized, skipping emit');
+      return;
+    }
+
+    log.debug('AI processing skipped, no text found', { filename });
+    this.namespace.emit('ai_processing_skipped', AI_SKIPPED_PAYLOAD);
   }
 
   /**
@@ -655,7 +771,7 @@ class DataHandler extends EventEmitter {
       return;
     }
 
-    log.info('AI processing completed', {
+    log.debug('AI processing completed', {
       messageId,
       responseLength: response?.length,
     });
@@ -0,0 +1,58 @@
+/**
+ * Primary display resolution lookup
+ * systeminformation.graphics() shells out to the OS (system_profiler on
+ * macOS) and takes hundreds of milliseconds, so the result is cached and
+ * shared by every crop instead of being queried per screenshot
+ */
+import logger from './logger.js';
+
+const log = logger('Display');
+
+// Re-query after this long so a display change is eventually picked up
+const DISPLAY_CACHE_TTL = 60 * 1000;
+
+let cachedDisplay = null;
+let cachedAt = 0;
+let pendingLookup = null;
+
+const queryPrimaryDisplay = async () => {
+  const si = await import('systeminformation');
+  const graphics = await si.default.graphics();
+
+  // Find primary display (usually first one)
+  const primaryDisplay = graphics.displays && graphics.displays[0];
+  // Use current resolution if available, otherwise use max resolution
+  return {
+    width: primaryDisplay?.currentResX || primaryDisplay?.resolutionX || null,
+    height: primaryDisplay?.currentResY || primaryDisplay?.resolutionY || null,
+  };
+};
+
+/**
+ * Get primary display resolution as { width, height }
+ * Values are null when the resolution is not available
+ */
+export const getPrimaryDisplaySize = async () => {
+  if (cachedDisplay && performance.now() - cachedAt < DISPLAY_CACHE_TTL) {
+    return cachedDisplay;
+  }
+
+  // Share one in-flight lookup between concurrent callers
+  if (!pendingLookup) {
+    pendingLookup = queryPrimaryDisplay()
+      .then((display) => {
+        cachedDisplay = display;
+        cachedAt = performance.now();
+        return display;
+      })
+      .catch((err) => {
+        log.warn('Could not read display resolution', { error: err.message });
+        return { width: null, height: null };
+      })
+      .finally(() => {
+        pendingLookup = null;
+      });
+  }
+
+  return pendingLookup;
+};
@@ -3,6 +3,7 @@
  * Provides structured logging with appropriate log levels
  */
 const LOG_LEVELS = {
+  SILENT: -1, // Disables all output; every log call returns immediately
   ERROR: 0,
   WARN: 1,
   INFO: 2,
@@ -13,18 +14,39 @@ const LOG_LEVEL = process.env.LOG_LEVEL || 'INFO';
 const CURRENT_LOG_LEVEL =
   LOG_LEVELS[LOG_LEVEL.toUpperCase()] ?? LOG_LEVELS.INFO;
 
+// Last formatted timestamp, reused for lines logged within the same ms
+let lastTimestampMs = 0;
+let lastTimestamp = '';
+
+const getTimestamp = () => {
+  const now = Date.now();
+  if (now !== lastTimestampMs) {
+    lastTimestampMs = now;
+    lastTimestamp = new Date(now).toISOString();
+  }
+  return lastTimestamp;
+};
+
 class Logger {
   constructor(module) {
     this.module = module || 'App';
+    this.moduleTag = `[${this.module}]`;
   }
 
   _shouldLog(level) {
     return LOG_LEVELS[level] <= CURRENT_LOG_LEVEL;
   }
 
+  /**
+   * Check whether a level is enabled, so hot paths can skip building
+   * log data entirely when it would be discarded
+   */
+  isEnabled(level) {
+    return this._shouldLog(level);
+  }
+
   _formatMessage(level, message, data = null) {
-    const timestamp = new Date().toISOString();
-    const prefix = `[${timestamp}] [${level}] [${this.module}]`;
+    const prefix = `[${getTimestamp()}] [${level}] ${this.moduleTag}`;
 
     if (data) {
       return `${prefix} ${message} ${JSON.stringify(data)}`;